@@ -477,11 +477,16 @@ class AdvancedRAGService:
             
             logger.info(f"Context consolidated: {context_info['total_sources']} sources, {context_info['context_length']} chars")
             
-            # Prepare sources
+            # Prepare sources; truncate content server-side when the client
+            # only renders previews, so full chunks aren't shipped and discarded
+            preview_chars = request.source_preview_chars
             sources = []
             for i, result in enumerate(search_results, 1):
+                content = result.get("content", "")
+                if preview_chars and len(content) > preview_chars:
+                    content = content[:preview_chars]
                 sources.append(Source(
-                    content=result.get("content", ""),
+                    content=content,
                     file_name=result.get("file_name", "Unknown"),
                     source_type=self._detect_source_type(result.get("file_name", "")),
                     score=result.get("enhanced_score", result.get("score", 0.0)),
@@ -122,6 +122,25 @@ def get_collection_status():
         raise HTTPException(status_code=500, detail=f"Failed to get collection status: {str(e)}")
 
 
+@app.get("/bulk-status", tags=["Health"])
+def bulk_status():
+    """Coalesced status snapshot: health + collection + stats + categories.
+
+    Lets clients (e.g. the frontend sidebar) refresh everything in a single
+    round-trip instead of four separate requests.
+    """
+    try:
+        collection = get_collection_status()
+    except HTTPException as e:
+        collection = {"status": "error", "detail": e.detail}
+    return {
+        "health": healthcheck(),
+        "collection": collection,
+        "stats": get_system_stats(),
+        "categories": get_available_categories(),
+    }
+
+
 @app.post("/ask", response_model=RAGResponse, tags=["RAG"])
 def ask_question(request: QuestionRequest):
     try:
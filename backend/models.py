@@ -46,6 +46,9 @@ class QuestionRequest(BaseModel):
     max_sources: Optional[int] = Field(default=4, ge=1, le=10)
     include_metadata: Optional[bool] = True
     session_id: Optional[str] = None
+    # When set, source content is truncated server-side to this many
+    # characters so clients that only render previews don't ship full chunks
+    source_preview_chars: Optional[int] = Field(default=None, ge=50, le=2000)
 
 
 class AnswerMetadata(BaseModel):
@@ -1,13 +1,23 @@
 import os
 import time
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
 import streamlit as st
 from typing import Optional, Dict, Any, List
-import json
+import orjson
+import string
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
+
+# plotly is imported lazily inside the figure helpers below: its ~200-400 ms
+# import cost is only paid the first time a chart is actually built
 
 # === PAGE CONFIGURATION ===
 st.set_page_config(
@@ -93,22 +103,138 @@ st.markdown("""
 # === CONFIGURATION ===
 DEFAULT_BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000")
 
+# Per-endpoint (connect, read) timeouts: health probes fail fast so the UI
+# reports an unhealthy backend quickly, while /ask is allowed to run long.
+TIMEOUTS = {
+    "health": (2, 3),
+    "search": (3, 15),
+    "ask": (5, 120),
+    "stats": (2, 5),
+}
+
+
+# Static system facts shown in the sidebar; module scope so the dict isn't
+# reallocated on every rerun
+SYSTEM_INFO = {
+    "Vector DB": "Qdrant Cloud",
+    "Region": "EU-West-2",
+    "Embeddings": "Azure OpenAI",
+    "Model": "text-embedding-3-small",
+    "LLM": "GPT-4/5",
+    "Dimensions": "1536"
+}
+
+# Confidence indicator mappings, shared by the display helpers
+CONFIDENCE_COLORS = {
+    "high": "🟢",
+    "medium": "🟡",
+    "low": "🟠",
+    "uncertain": "🔴"
+}
+
+CONFIDENCE_TEXT = {
+    "high": "High Confidence",
+    "medium": "Medium Confidence",
+    "low": "Low Confidence",
+    "uncertain": "Uncertain"
+}
+
+# Starter questions shown on an empty chat page (tuple: immutable, built once)
+SUGGESTIONS = (
+    "What are the main building requirements?",
+    "Summarize the energy efficiency measures",
+    "What safety protocols are mentioned?",
+    "List all document categories",
+    "What are the compliance requirements?",
+    "Describe the project timeline"
+)
+
+# Source type icons, defined once at module scope so they aren't rebuilt per call
+# Static footer blob; st.html skips the markdown parser entirely
+_FOOTER_HTML = """
+<div style='text-align: center; color: #666; padding: 1rem; margin-top: 2rem; border-top: 1px solid #eee;'>
+    <p>🧠 <strong>RAG Document Assistant Pro v3.0</strong> | Powered by Qdrant Cloud & Azure OpenAI</p>
+    <p>💡 Enhanced with multi-page navigation, analytics, and advanced search capabilities!</p>
+</div>
+"""
+
+_STATUS_EMOJI = {
+    "healthy": "🟢",
+    "unhealthy": "🟡",
+    "timeout": "🔴",
+    "connection_error": "🔴",
+    "error": "🔴"
+}
+
+TYPE_ICONS = {
+    "pdf": "📄",
+    "docx": "📝",
+    "txt": "📄",
+    "xlsx": "📊",
+    "image": "🖼️",
+    "other": "📎"
+}
+
+# Template for a single source card; all cards for an answer are rendered
+# into one markdown call instead of one st.markdown per source
+_SOURCE_CARD_TPL = string.Template("""
+<div class="source-card">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+        <strong>$icon $file_name</strong>
+        <span style="font-size: 0.8rem; color: #6c757d;">
+            Score: $score
+        </span>
+    </div>
+    <div style="font-size: 0.9rem; color: #495057; max-height: 100px; overflow-y: auto;">
+        $content
+    </div>
+</div>
+""")
+
+_CATEGORY_CARD_TPL = string.Template("""
+<div style="flex: 1 1 160px; padding: 0.6rem 0.8rem; border: 1px solid #e9ecef; border-radius: 0.5rem; text-align: center;">
+    <div style="font-size: 0.85rem; color: #6c757d;">$name</div>
+    <div style="font-size: 1.4rem; font-weight: bold;">$count</div>
+</div>
+""")
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session() -> requests.Session:
+    """Shared HTTP session with retry/backoff for transient upstream errors."""
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET", "POST"],
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 # === SESSION STATE INITIALIZATION ===
 def initialize_session_state():
     """Initialize all session state variables"""
     defaults = {
-        "conversation_history": [],
+        # Bounded deques so long sessions can't grow these without limit
+        "conversation_history": deque(maxlen=500),
         "backend_status": None,
         "last_health_check": 0,
         "collection_info": None,
-        "search_history": [],
+        "search_history": deque(maxlen=500),
         "favorite_questions": [],
-        "response_times": [],
+        # Columnar response-time buffers: preallocated ndarrays grown by
+        # doubling, so analytics reruns read array views instead of
+        # re-parsing a list of dicts
+        "rt_times": None,
+        "rt_values": None,
+        "_rt_n": 0,
+        "ema_response_time": None,
         "current_page": "chat",
         "advanced_mode": False,
-        "conversation_context": {},
-        "system_stats": None,
-        "last_stats_update": 0
+        "conversation_context": {}
     }
     
     for key, default_value in defaults.items():
@@ -117,50 +243,251 @@ def initialize_session_state():
 
 initialize_session_state()
 
+
+# Keep at most this many response-time samples; older ones are dropped
+# when the buffer would otherwise keep doubling
+_RT_KEEP = 1000
+
+
+def _append_response_time(timestamp: datetime, value: float) -> None:
+    """Append one sample to the columnar response-time buffers."""
+    n = st.session_state._rt_n
+    times = st.session_state.rt_times
+
+    if times is None or n >= len(times):
+        if times is not None and n >= 2 * _RT_KEEP:
+            # Buffer is large enough: recycle in place, keeping the tail
+            times[:_RT_KEEP] = times[n - _RT_KEEP:n]
+            st.session_state.rt_values[:_RT_KEEP] = st.session_state.rt_values[n - _RT_KEEP:n]
+            n = _RT_KEEP
+        else:
+            cap = 64 if times is None else 2 * len(times)
+            new_times = np.empty(cap, dtype="datetime64[us]")
+            new_values = np.empty(cap, dtype=np.float64)
+            if times is not None:
+                new_times[:n] = times[:n]
+                new_values[:n] = st.session_state.rt_values[:n]
+            st.session_state.rt_times = new_times
+            st.session_state.rt_values = new_values
+
+    st.session_state.rt_times[n] = np.datetime64(timestamp)
+    st.session_state.rt_values[n] = value
+    st.session_state._rt_n = n + 1
+
 # === UTILITY FUNCTIONS ===
+def _lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int = 1500) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Returns indices of at most ``n_out`` points chosen to preserve the visual
+    shape of the series, so charts never ship more points to the browser than
+    a screen can usefully display.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    bins = np.linspace(1, n - 1, n_out - 1, dtype=np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bins[i], bins[i + 1]
+        avg_hi = bins[i + 2] if i + 2 <= n_out - 2 else n
+        avg_x = x[hi:avg_hi].mean()
+        avg_y = y[hi:avg_hi].mean()
+
+        bucket_x = x[lo:hi]
+        bucket_y = y[lo:hi]
+        areas = np.abs(
+            (x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+
+# Figure builders are cached on their (hashable) inputs so navigating away
+# from the analytics page and back doesn't re-serialize identical figures.
+@st.cache_data(show_spinner=False)
+def _response_trend_fig(timestamps: tuple, values: tuple):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scattergl(x=list(timestamps), y=list(values), mode="lines"))
+    fig.update_layout(
+        title="Response Time Trend",
+        xaxis_title="Time",
+        yaxis_title="Response Time (ms)",
+        transition_duration=0,
+        uirevision="static"
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _histogram_fig(values: tuple, bins, title: str, xaxis_title: str):
+    import plotly.graph_objects as go
+
+    counts, bin_edges = np.histogram(values, bins=bins)
+    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    fig = go.Figure(go.Bar(x=bin_centers, y=counts))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title="Frequency",
+        transition_duration=0,
+        uirevision="static"
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _search_scores_fig(scores: tuple, vector_scores: Optional[tuple], search_type: str):
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    if search_type == "intelligent":
+        fig = go.Figure()
+        fig.add_trace(go.Bar(name='Relevance Score', x=list(range(1, len(scores) + 1)), y=list(scores)))
+        fig.add_trace(go.Bar(name='Vector Score', x=list(range(1, len(vector_scores) + 1)), y=list(vector_scores)))
+        fig.update_layout(
+            title="Intelligent Search Scoring",
+            xaxis_title="Result #",
+            yaxis_title="Score",
+            barmode='group',
+            transition_duration=0,
+            uirevision='static'
+        )
+    else:
+        fig = px.bar(
+            x=list(range(1, len(scores) + 1)),
+            y=list(scores),
+            title="Basic Search Relevance Scores",
+            labels={"x": "Result #", "y": "Relevance Score"}
+        )
+        fig.update_layout(transition_duration=0, uirevision='static')
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _success_pie_fig(successful: int, total: int):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=["Successful", "Failed"],
+            values=[successful, total - successful],
+            title="Query Success Rate"
+        )
+    ])
+    fig.update_layout(transition_duration=0, uirevision="static")
+    return fig
+
+
+def fetch_many(backend_url: str, endpoints: List[str], timeout=TIMEOUTS["stats"]) -> Dict[str, Any]:
+    """Fetch several GET endpoints concurrently via httpx.
+
+    Used on paths that would otherwise issue sequential requests within one
+    rerun; total latency collapses to the slowest call. Returns a dict of
+    endpoint -> parsed JSON (or None on failure).
+    """
+    connect, read = timeout
+
+    async def _gather():
+        limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        async with httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(read, connect=connect)
+        ) as client:
+            async def _one(endpoint: str):
+                try:
+                    response = await client.get(f"{backend_url}{endpoint}")
+                    return response.json() if response.status_code == 200 else None
+                except (httpx.HTTPError, ValueError):
+                    return None
+
+            results = await asyncio.gather(*[_one(e) for e in endpoints])
+            return dict(zip(endpoints, results))
+
+    return asyncio.run(_gather())
+
+
+@st.cache_data(ttl=20, show_spinner=False)
+def get_bulk_status(backend_url: str) -> Optional[Dict[str, Any]]:
+    """Fetch health, collection, stats and categories in a single round-trip.
+
+    Returns None when the `/bulk-status` endpoint is unavailable (older
+    backends), letting callers fall back to the individual endpoints.
+    """
+    try:
+        response = get_http_session().get(f"{backend_url}/bulk-status", timeout=TIMEOUTS["health"])
+        if response.ok:
+            return response.json()
+    except requests.exceptions.RequestException:
+        pass
+    return None
+
+
 def check_backend_health(backend_url: str) -> Dict[str, Any]:
     """Enhanced backend health check with more details"""
     try:
         start_time = time.time()
-        
-        # Health check
-        health_response = requests.get(f"{backend_url}/healthcheck", timeout=10)
-        health_time = round((time.time() - start_time) * 1000, 2)
-        
-        # Collection status
-        try:
-            collection_response = requests.get(f"{backend_url}/collection-status", timeout=10)
-            collection_data = collection_response.json() if collection_response.ok else {}
-        except:
-            collection_data = {}
-        
-        if health_response.ok and health_response.json().get("status") == "ok":
+
+        # Prefer the coalesced endpoint: one request covers health, collection
+        # info and stats instead of separate round-trips
+        bulk = get_bulk_status(backend_url)
+        if bulk is not None:
+            health_time = round((time.time() - start_time) * 1000, 2)
+            # Stats travel in the returned dict rather than session state:
+            # this function also runs on worker threads, where Streamlit
+            # session-state writes silently no-op
+            if bulk.get("health", {}).get("status") == "ok":
+                return {
+                    "status": "healthy",
+                    "response_time": health_time,
+                    "message": "✅ Backend is healthy",
+                    "collection_info": bulk.get("collection", {}).get("collection_info", {}),
+                    "stats": bulk.get("stats"),
+                    "timestamp": datetime.now().strftime("%H:%M:%S")
+                }
             return {
-                "status": "healthy",
+                "status": "unhealthy",
                 "response_time": health_time,
-                "message": "✅ Backend is healthy",
-                "collection_info": collection_data.get("collection_info", {}),
+                "message": "⚠️ Health check failed",
                 "timestamp": datetime.now().strftime("%H:%M:%S")
             }
-        else:
+
+        # Fallback for backends without /bulk-status: both probes run
+        # concurrently instead of back-to-back
+        responses = fetch_many(
+            backend_url,
+            ["/healthcheck", "/collection-status"],
+            timeout=TIMEOUTS["health"]
+        )
+        health_time = round((time.time() - start_time) * 1000, 2)
+        health_data = responses["/healthcheck"]
+        collection_data = responses["/collection-status"] or {}
+
+        if health_data is None:
             return {
-                "status": "unhealthy",
+                "status": "connection_error",
+                "response_time": None,
+                "message": "🔴 Cannot connect to backend",
+                "timestamp": datetime.now().strftime("%H:%M:%S")
+            }
+        if health_data.get("status") == "ok":
+            return {
+                "status": "healthy",
                 "response_time": health_time,
-                "message": "⚠️ Health check failed",
+                "message": "✅ Backend is healthy",
+                "collection_info": collection_data.get("collection_info", {}),
                 "timestamp": datetime.now().strftime("%H:%M:%S")
             }
-    except requests.exceptions.Timeout:
-        return {
-            "status": "timeout",
-            "response_time": None,
-            "message": "🔴 Backend timeout (>10s)",
-            "timestamp": datetime.now().strftime("%H:%M:%S")
-        }
-    except requests.exceptions.ConnectionError:
         return {
-            "status": "connection_error", 
-            "response_time": None,
-            "message": "🔴 Cannot connect to backend",
+            "status": "unhealthy",
+            "response_time": health_time,
+            "message": "⚠️ Health check failed",
             "timestamp": datetime.now().strftime("%H:%M:%S")
         }
     except Exception as e:
@@ -175,15 +502,15 @@ def search_documents(backend_url: str, query: str, limit: int = 5) -> Dict[str,
     """Search documents without generating an answer"""
     try:
         start_time = time.time()
-        response = requests.get(
+        response = get_http_session().get(
             f"{backend_url}/search",
             params={"q": query, "limit": limit},
-            timeout=30
+            timeout=TIMEOUTS["search"]
         )
         response_time = round((time.time() - start_time) * 1000, 2)
         
         if response.ok:
-            data = response.json()
+            data = orjson.loads(response.content)
             return {
                 "success": True,
                 "results": data.get("results", []),
@@ -221,15 +548,15 @@ def intelligent_search(backend_url: str, query: str, limit: int = 5,
         if document_types:
             params["document_types"] = ",".join(document_types)
         
-        response = requests.get(
+        response = get_http_session().get(
             f"{backend_url}/intelligent-search",
             params=params,
-            timeout=30
+            timeout=TIMEOUTS["search"]
         )
         response_time = round((time.time() - start_time) * 1000, 2)
         
         if response.ok:
-            result_data = response.json()
+            result_data = orjson.loads(response.content)
             return {
                 "success": True,
                 "results": result_data.get("results", []),
@@ -255,10 +582,15 @@ def intelligent_search(backend_url: str, query: str, limit: int = 5,
         }
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_available_categories(backend_url: str) -> Dict[str, Any]:
-    """Get available document categories from the backend"""
+    """Get available document categories from the backend.
+
+    Categories only change when the admin re-ingests documents, so the result
+    is cached aggressively; use the "Refresh Categories" button to invalidate.
+    """
     try:
-        response = requests.get(f"{backend_url}/categories", timeout=10)
+        response = get_http_session().get(f"{backend_url}/categories", timeout=TIMEOUTS["stats"])
         if response.ok:
             return response.json()
         else:
@@ -275,7 +607,10 @@ def ask_question(backend_url: str, question: str, context: Dict[str, Any] = None
         payload = {
             "question": question,
             "max_sources": 4,
-            "include_metadata": True
+            "include_metadata": True,
+            # Source cards only render ~300 chars; ask the backend to truncate
+            # instead of shipping full chunk bodies that get discarded
+            "source_preview_chars": 320
         }
         
         # Add conversation context if available
@@ -286,23 +621,27 @@ def ask_question(backend_url: str, question: str, context: Dict[str, Any] = None
                 "user_preferences": context.get("user_preferences")
             }
         
-        response = requests.post(
-            f"{backend_url}/ask", 
-            json=payload, 
-            timeout=120
+        response = get_http_session().post(
+            f"{backend_url}/ask",
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=TIMEOUTS["ask"]
         )
         response_time = round((time.time() - start_time) * 1000, 2)
         
         # Store response time for analytics
-        st.session_state.response_times.append({
-            "timestamp": datetime.now(),
-            "response_time": response_time,
-            "question_length": len(question)
-        })
+        _append_response_time(datetime.now(), response_time)
+
+        # Maintain a running EMA so the metrics header doesn't recompute per rerun
+        previous_ema = st.session_state.ema_response_time
+        if previous_ema is None:
+            st.session_state.ema_response_time = response_time
+        else:
+            st.session_state.ema_response_time = 0.2 * response_time + 0.8 * previous_ema
         
         if response.ok:
-            data = response.json()
-            
+            data = orjson.loads(response.content)
+
             # Handle new enhanced response structure
             if "metadata" in data:
                 # New enhanced response format
@@ -356,7 +695,7 @@ def ask_question(backend_url: str, question: str, context: Dict[str, Any] = None
 def get_system_stats(backend_url: str) -> Dict[str, Any]:
     """Get system statistics from backend"""
     try:
-        response = requests.get(f"{backend_url}/stats", timeout=10)
+        response = get_http_session().get(f"{backend_url}/stats", timeout=TIMEOUTS["stats"])
         if response.ok:
             return {
                 "success": True,
@@ -371,22 +710,8 @@ def get_system_stats(backend_url: str) -> Dict[str, Any]:
 
 def display_confidence_indicator(confidence_level: str, reasoning: str = ""):
     """Display confidence level with visual indicator"""
-    confidence_colors = {
-        "high": "🟢",
-        "medium": "🟡", 
-        "low": "🟠",
-        "uncertain": "🔴"
-    }
-    
-    confidence_text = {
-        "high": "High Confidence",
-        "medium": "Medium Confidence",
-        "low": "Low Confidence", 
-        "uncertain": "Uncertain"
-    }
-    
-    icon = confidence_colors.get(confidence_level.lower(), "⚪")
-    text = confidence_text.get(confidence_level.lower(), confidence_level.title())
+    icon = CONFIDENCE_COLORS.get(confidence_level.lower(), "⚪")
+    text = CONFIDENCE_TEXT.get(confidence_level.lower(), confidence_level.title())
     
     st.markdown(f"""
     <div style="
@@ -404,6 +729,15 @@ def display_confidence_indicator(confidence_level: str, reasoning: str = ""):
     """, unsafe_allow_html=True)
 
 
+def _queue_question(question: str):
+    """Queue a question for processing at the top of the next script run.
+
+    Used as a button callback so a click costs one rerun instead of a
+    synchronous ask followed by an extra full rerun.
+    """
+    st.session_state.processing_question = question
+
+
 def display_follow_up_questions(follow_ups: List[Dict], backend_url: str):
     """Display and handle follow-up questions"""
     if not follow_ups:
@@ -437,18 +771,13 @@ def display_follow_up_questions(follow_ups: List[Dict], backend_url: str):
             """, unsafe_allow_html=True)
         
         with col2:
-            if st.button("Ask", key=f"followup_{i}", use_container_width=True):
-                # Add the follow-up question to the chat
-                result = ask_question(backend_url, question, st.session_state.conversation_context)
-                
-                # Update conversation history
-                history_entry = {
-                    "question": question,
-                    "timestamp": datetime.now().strftime("%H:%M:%S"),
-                    "result": result
-                }
-                st.session_state.conversation_history.append(history_entry)
-                st.rerun()
+            st.button(
+                "Ask",
+                key=f"followup_{i}",
+                use_container_width=True,
+                on_click=_queue_question,
+                args=(question,)
+            )
 
 
 def update_conversation_context(question: str, result: Dict[str, Any]):
@@ -536,40 +865,155 @@ def display_enhanced_answer(result: Dict[str, Any], show_metadata: bool = True):
                 for limitation in limitations:
                     st.warning(limitation)
     
-    # Display sources
+    # Display sources as a single pre-rendered HTML block
     if sources:
         with st.expander(f"📚 Sources ({len(sources)} documents)", expanded=False):
-            for i, source in enumerate(sources):
-                source_type = source.get("source_type", "unknown")
-                file_name = source.get("file_name", "Unknown file")
-                score = source.get("score", 0)
+            html_parts = []
+            for source in sources:
                 content = source.get("content", "")
-                
-                # Source type icons
-                type_icons = {
-                    "pdf": "📄",
-                    "docx": "📝", 
-                    "txt": "📄",
-                    "xlsx": "📊",
-                    "image": "🖼️",
-                    "other": "📎"
-                }
-                
-                icon = type_icons.get(source_type, "📎")
-                
-                st.markdown(f"""
-                <div class="source-card">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                        <strong>{icon} {file_name}</strong>
-                        <span style="font-size: 0.8rem; color: #6c757d;">
-                            Score: {score:.3f}
-                        </span>
-                    </div>
-                    <div style="font-size: 0.9rem; color: #495057; max-height: 100px; overflow-y: auto;">
-                        {content[:300]}{"..." if len(content) > 300 else ""}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                html_parts.append(_SOURCE_CARD_TPL.substitute(
+                    icon=TYPE_ICONS.get(source.get("source_type", "unknown"), "📎"),
+                    file_name=source.get("file_name", "Unknown file"),
+                    score=f"{source.get('score', 0):.3f}",
+                    content=content[:300] + ("..." if len(content) > 300 else "")
+                ))
+            st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+
+@st.fragment
+def _render_search_results(search_result: Dict[str, Any], search_type: str):
+    """Render the search-results panel.
+
+    Runs as a fragment so interactions inside it (the result inspector
+    selectbox) rerun only this panel instead of the whole page.
+    """
+    results = search_result["results"]
+    metadata = search_result.get("metadata", {})
+
+    # Search Results Header
+    st.markdown("---")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📊 Results Found", len(results))
+    with col2:
+        st.metric("⚡ Response Time", f"{search_result['response_time']}ms")
+    with col3:
+        st.metric("🔍 Search Type", search_type.title())
+    with col4:
+        if search_type == "intelligent" and metadata.get("auto_filter_applied"):
+            st.metric("🎯 Auto-Filter", "Applied")
+        else:
+            st.metric("🎯 Auto-Filter", "None")
+
+    # Display intelligent search metadata
+    if search_type == "intelligent" and metadata:
+        st.markdown("#### 🧠 Intelligent Search Insights")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if metadata.get("filtered_categories"):
+                st.info(f"🎯 **Categories Detected:** {', '.join(metadata['filtered_categories'])}")
+
+        with col2:
+            if metadata.get("filtered_document_types"):
+                st.info(f"📄 **Document Types:** {', '.join(metadata['filtered_document_types'])}")
+
+    # Results Visualization (advanced mode only; skipped for tiny result
+    # sets where a chart adds nothing over the table)
+    if results and st.session_state.advanced_mode and len(results) > 3:
+        if search_type == "intelligent":
+            scores = np.fromiter(
+                (r.get('relevance_score', 0) for r in results),
+                dtype=np.float32, count=len(results)
+            )
+            vector_scores = np.fromiter(
+                (r.get('vector_score', 0) for r in results),
+                dtype=np.float32, count=len(results)
+            )
+            fig = _search_scores_fig(tuple(scores.tolist()), tuple(vector_scores.tolist()), "intelligent")
+        else:
+            scores = np.fromiter(
+                (r.get('score', 0) for r in results),
+                dtype=np.float32, count=len(results)
+            )
+            fig = _search_scores_fig(tuple(scores.tolist()), None, "basic")
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Display Results: one virtualized dataframe instead of O(N) widgets
+    st.markdown("#### 📋 Search Results")
+    if search_type == "intelligent":
+        results_df = pd.DataFrame([
+            {
+                "rank": i,
+                "file": r.get("metadata", {}).get("file_name", "Unknown"),
+                "relevance": r.get("relevance_score", 0),
+                "vector": r.get("vector_score", 0),
+                "category_match": r.get("category_match", False)
+            }
+            for i, r in enumerate(results, 1)
+        ])
+    else:
+        results_df = pd.DataFrame([
+            {
+                "rank": i,
+                "file": r.get("file_name", "Unknown"),
+                "score": r.get("score", 0)
+            }
+            for i, r in enumerate(results, 1)
+        ])
+    st.dataframe(results_df, use_container_width=True, hide_index=True)
+
+    # Detailed view rendered on demand for a single selected result
+    selected_rank = st.selectbox("🔎 Inspect result", results_df["rank"])
+    result = results[selected_rank - 1]
+
+    if search_type == "intelligent":
+        relevance_score = result.get('relevance_score', 0)
+        vector_score = result.get('vector_score', 0)
+        metadata_info = result.get('metadata', {})
+
+        with st.expander(f"{selected_rank}. {metadata_info.get('file_name', 'Unknown')} (Relevance: {relevance_score:.3f})", expanded=True):
+            col1, col2 = st.columns([3, 1])
+
+            with col1:
+                st.markdown("**Content:**")
+                # st.code is a stateless display element; text_area allocates
+                # a widget-state slot and hydrates an editable DOM node
+                content = result.get('content', 'No content available')
+                show_full = len(content) > 2000 and st.checkbox(
+                    "Show full content", key=f"full_result_{selected_rank}"
+                )
+                st.code(content if show_full else content[:2000], language=None)
+
+            with col2:
+                st.markdown("**📊 Scores:**")
+                st.metric("Relevance", f"{relevance_score:.3f}")
+                st.metric("Vector", f"{vector_score:.3f}")
+
+                st.markdown("**📁 Metadata:**")
+                st.markdown("\n".join(
+                    f"- **{key}**: {value}"
+                    for key, value in metadata_info.items()
+                    if value and key != 'technical_keywords'
+                ))
+
+                # Technical keywords
+                keywords = metadata_info.get('technical_keywords', [])
+                if keywords:
+                    st.markdown("**🔬 Keywords:**")
+                    st.code(" ".join(keywords[:5]))  # Show first 5
+    else:
+        with st.expander(f"{selected_rank}. {result.get('file_name', 'Unknown')} (Score: {result.get('score', 0):.3f})", expanded=True):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.markdown("**Content:**")
+                st.text(result.get('content', 'No content available'))
+            with col2:
+                st.markdown("**Metadata:**")
+                metadata_info = result.get('metadata', {})
+                st.markdown("\n".join(
+                    f"- **{key}**: {value}" for key, value in metadata_info.items()
+                ))
+
 
 def upload_documents_notice():
     """Show notice about deprecated upload functionality"""
@@ -607,39 +1051,48 @@ with st.sidebar:
     st.markdown("#### 🔧 Backend Configuration")
     backend_url = st.text_input("Backend URL", value=DEFAULT_BACKEND_URL)
     
-    # Enhanced Health Check
-    st.markdown("#### 📊 System Health")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("🏥 Health Check", use_container_width=True):
-            with st.spinner("Checking..."):
-                st.session_state.backend_status = check_backend_health(backend_url)
-                st.session_state.last_health_check = time.time()
-    
-    with col2:
-        auto_check = st.checkbox("Auto-check", help="Automatically check health every 30s")
-    
-    # Auto health check
-    if auto_check and (time.time() - st.session_state.last_health_check > 30):
-        st.session_state.backend_status = check_backend_health(backend_url)
-        st.session_state.last_health_check = time.time()
-        st.rerun()
-    
-    # Enhanced status display
-    if st.session_state.backend_status:
-        status = st.session_state.backend_status
-        if status["status"] == "healthy":
-            st.success(f'{status["message"]} ({status["response_time"]}ms)')
-            if "collection_info" in status and status["collection_info"]:
-                collection = status["collection_info"]
-                st.info(f"📚 Documents: {collection.get('points_count', 'N/A')}")
-        elif status["status"] == "unhealthy":
-            st.warning(status["message"])
-        else:
-            st.error(status["message"])
-        
-        st.caption(f"Last checked: {status.get('timestamp', 'Unknown')}")
+    # Enhanced Health Check - only for pages that actually talk to the backend,
+    # so Analytics/Settings reruns don't trigger network probes
+    if st.session_state.current_page in {"chat", "search"}:
+        st.markdown("#### 📊 System Health")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if st.button("🏥 Health Check", use_container_width=True):
+                with st.spinner("Checking..."):
+                    get_bulk_status.clear()  # explicit check should bypass the cached snapshot
+                    st.session_state.backend_status = check_backend_health(backend_url)
+                    st.session_state.last_health_check = time.time()
+
+        with col2:
+            auto_check = st.checkbox("Auto-check", help="Automatically check health every 30s")
+
+        # Auto health check
+        if auto_check and (time.time() - st.session_state.last_health_check > 30):
+            st.session_state.backend_status = check_backend_health(backend_url)
+            st.session_state.last_health_check = time.time()
+            st.rerun()
+
+        # Enhanced status display
+        if st.session_state.backend_status:
+            status = st.session_state.backend_status
+            if status["status"] == "healthy":
+                st.success(f'{status["message"]} ({status["response_time"]}ms)')
+                if "collection_info" in status and status["collection_info"]:
+                    collection = status["collection_info"]
+                    st.info(f"📚 Documents: {collection.get('points_count', 'N/A')}")
+                if status.get("stats"):
+                    stats = status["stats"]
+                    st.caption(
+                        f"⚙️ System: {stats.get('system_health', 'N/A')} · "
+                        f"avg response {stats.get('avg_response_time_ms', 0):.0f}ms"
+                    )
+            elif status["status"] == "unhealthy":
+                st.warning(status["message"])
+            else:
+                st.error(status["message"])
+
+            st.caption(f"Last checked: {status.get('timestamp', 'Unknown')}")
     
     # Document Management Notice
     st.markdown("---")
@@ -652,16 +1105,22 @@ with st.sidebar:
     st.markdown("#### ⚡ Quick Actions")
     
     if st.button("🗑️ Clear Chat History", use_container_width=True):
-        st.session_state.conversation_history = []
+        # clear() keeps the bounded deque; reassigning a list would drop
+        # the maxlen cap for the rest of the session
+        st.session_state.conversation_history.clear()
         st.success("Chat history cleared!")
     
     if st.button("📊 Run System Test", use_container_width=True):
         with st.spinner("Testing system..."):
-            # Test health
-            health = check_backend_health(backend_url)
+            # Health and search probes are independent and I/O-bound,
+            # so run them concurrently instead of back-to-back
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                health_future = executor.submit(check_backend_health, backend_url)
+                search_future = executor.submit(search_documents, backend_url, "test", 1)
+                health = health_future.result()
+                search_result = search_future.result()
+
             if health["status"] == "healthy":
-                # Test search
-                search_result = search_documents(backend_url, "test", 1)
                 if search_result["success"]:
                     st.success("✅ All systems operational!")
                 else:
@@ -677,20 +1136,12 @@ with st.sidebar:
         help="Show detailed technical information"
     )
     
-    # System Information
+    # System Information - collapsed so Streamlit doesn't serialize the
+    # content until the user opens it
     st.markdown("---")
-    st.markdown("#### ℹ️ System Info")
-    info_data = {
-        "Vector DB": "Qdrant Cloud",
-        "Region": "EU-West-2", 
-        "Embeddings": "Azure OpenAI",
-        "Model": "text-embedding-3-small",
-        "LLM": "GPT-4/5",
-        "Dimensions": "1536"
-    }
-    
-    for key, value in info_data.items():
-        st.markdown(f"**{key}:** {value}")
+    with st.expander("ℹ️ System Info", expanded=False):
+        for key, value in SYSTEM_INFO.items():
+            st.markdown(f"**{key}:** {value}")
 
 # === MAIN CONTENT BASED ON PAGE ===
 st.markdown('<div class="main-header">🧠 RAG Document Assistant Pro</div>', unsafe_allow_html=True)
@@ -721,12 +1172,12 @@ if st.session_state.backend_status and st.session_state.backend_status.get("coll
         )
     with col3:
         avg_response_time = "N/A"
-        if st.session_state.response_times:
-            avg_response_time = f"{sum(r['response_time'] for r in st.session_state.response_times[-10:]) / min(10, len(st.session_state.response_times)):.0f}ms"
+        if st.session_state.ema_response_time is not None:
+            avg_response_time = f"{st.session_state.ema_response_time:.0f}ms"
         st.metric(
-            "⚡ Avg Response", 
+            "⚡ Avg Response",
             avg_response_time,
-            help="Average response time for last 10 queries"
+            help="Exponential moving average of recent query response times"
         )
     with col4:
         st.metric(
@@ -758,6 +1209,27 @@ def handle_ask_question(question: str, backend_url: str):
         st.warning("⚠️ Backend health unknown. Please run a health check first.")
         return
 
+    # A cached "healthy" status can go stale; revalidate with a fast probe
+    # before committing to the long /ask timeout
+    if time.time() - st.session_state.last_health_check > 15:
+        try:
+            probe = get_http_session().get(f"{backend_url}/healthcheck", timeout=(2, 2))
+            probe_ok = probe.ok and probe.json().get("status") == "ok"
+        except requests.exceptions.RequestException:
+            probe_ok = False
+
+        if not probe_ok:
+            st.session_state.backend_status = {
+                "status": "connection_error",
+                "response_time": None,
+                "message": "🔴 Cannot connect to backend",
+                "timestamp": datetime.now().strftime("%H:%M:%S")
+            }
+            st.session_state.last_health_check = time.time()
+            st.error("⚠️ Backend became unreachable since the last health check. Question not sent.")
+            return
+        st.session_state.last_health_check = time.time()
+
     with st.spinner("🤔 Analyzing documents and generating answer..."):
         result = ask_question(backend_url, question.strip(), st.session_state.conversation_context)
         
@@ -774,24 +1246,23 @@ def handle_ask_question(question: str, backend_url: str):
 if st.session_state.current_page == "chat":
     # === CHAT PAGE ===
     st.markdown("### 💬 Intelligent Document Chat")
-    
+
+    # Process any queued question before rendering so the new entry appears
+    # in this pass without an extra rerun
+    if st.session_state.get("processing_question"):
+        question_to_process = st.session_state.processing_question
+        st.session_state.processing_question = None  # Clear after grabbing
+        handle_ask_question(question_to_process, backend_url)
+
+
     # Show suggested questions only if no conversation history exists
     if not st.session_state.conversation_history:
         st.markdown("#### 💡 Get Started with These Questions")
         st.markdown("*These suggestions will help you explore your documents. Click any question to get started!*")
         
         col1, col2, col3 = st.columns(3)
-        
-        suggestions = [
-            "What are the main building requirements?",
-            "Summarize the energy efficiency measures",
-            "What safety protocols are mentioned?",
-            "List all document categories",
-            "What are the compliance requirements?",
-            "Describe the project timeline"
-        ]
-        
-        for i, suggestion in enumerate(suggestions):
+
+        for i, suggestion in enumerate(SUGGESTIONS):
             col = [col1, col2, col3][i % 3]
             with col:
                 if st.button(f"💭 {suggestion}", key=f"suggest_{i}", use_container_width=True):
@@ -877,17 +1348,11 @@ if st.session_state.current_page == "chat":
             st.info("Already in favorites!")
     
     if clear_button:
-        st.session_state.conversation_history = []
+        # clear() keeps the bounded deque (see the sidebar clear button)
+        st.session_state.conversation_history.clear()
         st.success("History cleared!")
         st.rerun()
     
-    # Process the question if it was submitted
-    if st.session_state.get("processing_question"):
-        question_to_process = st.session_state.processing_question
-        st.session_state.processing_question = None  # Clear after grabbing
-        handle_ask_question(question_to_process, backend_url)
-        st.rerun()
-    
     # Process search only
     if search_button and question.strip():
         with st.spinner("🔍 Searching documents..."):
@@ -951,12 +1416,20 @@ elif st.session_state.current_page == "search":
     
     # Display available categories summary
     if available_categories:
-        st.markdown("#### 📂 Available Document Categories")
-        cols = st.columns(min(len(available_categories), 4))
-        for i, category in enumerate(available_categories):
-            with cols[i % 4]:
-                count = categories_data.get("categories", {}).get(category, 0)
-                st.metric(category.replace(" & ", " &\n"), count, help=f"Documents in {category}")
+        header_col, refresh_col = st.columns([4, 1])
+        with header_col:
+            st.markdown("#### 📂 Available Document Categories")
+        with refresh_col:
+            if st.button("🔄 Refresh Categories", help="Re-fetch categories after re-ingesting documents"):
+                get_available_categories.clear()
+                st.rerun()
+        # Single HTML emission instead of one st.metric widget per category
+        counts = categories_data.get("categories", {})
+        cards = "".join(
+            _CATEGORY_CARD_TPL.substitute(name=category, count=counts.get(category, 0))
+            for category in available_categories
+        )
+        st.markdown(f'<div style="display: flex; flex-wrap: wrap; gap: 0.75rem;">{cards}</div>', unsafe_allow_html=True)
     
     # Search Buttons
     col1, col2 = st.columns(2)
@@ -1000,123 +1473,16 @@ elif st.session_state.current_page == "search":
     # Display Results
     if search_result:
         if search_result["success"]:
-            results = search_result["results"]
-            metadata = search_result.get("metadata", {})
-            
             # Add to search history
             st.session_state.search_history.append({
                 "query": search_query,
-                "results_count": len(results),
+                "results_count": len(search_result["results"]),
                 "timestamp": datetime.now(),
                 "response_time": search_result["response_time"],
                 "search_type": search_type
             })
-            
-            # Search Results Header
-            st.markdown("---")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("📊 Results Found", len(results))
-            with col2:
-                st.metric("⚡ Response Time", f"{search_result['response_time']}ms")
-            with col3:
-                st.metric("🔍 Search Type", search_type.title())
-            with col4:
-                if search_type == "intelligent" and metadata.get("auto_filter_applied"):
-                    st.metric("🎯 Auto-Filter", "Applied")
-                else:
-                    st.metric("🎯 Auto-Filter", "None")
-            
-            # Display intelligent search metadata
-            if search_type == "intelligent" and metadata:
-                st.markdown("#### 🧠 Intelligent Search Insights")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if metadata.get("filtered_categories"):
-                        st.info(f"🎯 **Categories Detected:** {', '.join(metadata['filtered_categories'])}")
-                    
-                with col2:
-                    if metadata.get("filtered_document_types"):
-                        st.info(f"📄 **Document Types:** {', '.join(metadata['filtered_document_types'])}")
-            
-            # Results Visualization (for advanced mode)
-            if results and st.session_state.advanced_mode:
-                if search_type == "intelligent":
-                    scores = [r.get('relevance_score', 0) for r in results]
-                    vector_scores = [r.get('vector_score', 0) for r in results]
-                    
-                    fig = go.Figure()
-                    fig.add_trace(go.Bar(name='Relevance Score', x=list(range(1, len(scores) + 1)), y=scores))
-                    fig.add_trace(go.Bar(name='Vector Score', x=list(range(1, len(vector_scores) + 1)), y=vector_scores))
-                    fig.update_layout(
-                        title="Intelligent Search Scoring",
-                        xaxis_title="Result #",
-                        yaxis_title="Score",
-                        barmode='group'
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    scores = [r.get('score', 0) for r in results]
-                    fig = px.bar(
-                        x=list(range(1, len(scores) + 1)),
-                        y=scores,
-                        title="Basic Search Relevance Scores",
-                        labels={"x": "Result #", "y": "Relevance Score"}
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-            
-            # Display Results
-            st.markdown("#### 📋 Search Results")
-            for i, result in enumerate(results, 1):
-                if search_type == "intelligent":
-                    # Enhanced display for intelligent search
-                    relevance_score = result.get('relevance_score', 0)
-                    vector_score = result.get('vector_score', 0)
-                    category_match = result.get('category_match', False)
-                    
-                    relevance_color = "🟢" if relevance_score > 0.8 else "🟡" if relevance_score > 0.5 else "🔴"
-                    match_indicator = "🎯" if category_match else ""
-                    
-                    with st.expander(f"{relevance_color} {match_indicator} {i}. {result.get('metadata', {}).get('file_name', 'Unknown')} (Relevance: {relevance_score:.3f})"):
-                        # Metadata display
-                        col1, col2 = st.columns([3, 1])
-                        
-                        with col1:
-                            st.markdown("**Content:**")
-                            st.text_area("", result.get('content', 'No content available'), height=150, disabled=True, key=f"intelligent_result_{i}")
-                            
-                        with col2:
-                            st.markdown("**📊 Scores:**")
-                            st.metric("Relevance", f"{relevance_score:.3f}")
-                            st.metric("Vector", f"{vector_score:.3f}")
-                            
-                            st.markdown("**📁 Metadata:**")
-                            metadata_info = result.get('metadata', {})
-                            for key, value in metadata_info.items():
-                                if value and key != 'technical_keywords':
-                                    st.text(f"{key}: {value}")
-                            
-                            # Technical keywords
-                            keywords = metadata_info.get('technical_keywords', [])
-                            if keywords:
-                                st.markdown("**🔬 Keywords:**")
-                                for keyword in keywords[:5]:  # Show first 5
-                                    st.code(keyword)
-                else:
-                    # Basic display for traditional search
-                    relevance_color = "🟢" if result.get('score', 0) > 0.8 else "🟡" if result.get('score', 0) > 0.5 else "🔴"
-                    
-                    with st.expander(f"{relevance_color} {i}. {result.get('file_name', 'Unknown')} (Score: {result.get('score', 0):.3f})"):
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.markdown("**Content:**")
-                            st.text(result.get('content', 'No content available'))
-                        with col2:
-                            st.markdown("**Metadata:**")
-                            metadata_info = result.get('metadata', {})
-                            for key, value in metadata_info.items():
-                                st.text(f"{key}: {value}")
+
+            _render_search_results(search_result, search_type)
         else:
             st.error(f"❌ Search failed: {search_result['message']}")
     elif search_query.strip() and (intelligent_search_btn or basic_search_btn):
@@ -1127,62 +1493,68 @@ elif st.session_state.current_page == "search":
         st.markdown("---")
         st.markdown("### 📋 Recent Searches")
         
-        for search in st.session_state.search_history[-5:]:  # Show last 5
-            col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-            with col1:
-                st.text(search["query"])
-            with col2:
-                st.text(f"{search['results_count']} results")
-            with col3:
-                st.text(f"{search['response_time']}ms")
-            with col4:
-                st.text(search["timestamp"].strftime("%H:%M"))
+        # One dataframe widget instead of four st.text widgets per row;
+        # islice over reversed() grabs the newest 5 without copying the deque
+        hist_df = pd.DataFrame(list(islice(reversed(st.session_state.search_history), 5)))
+        hist_df = hist_df[["query", "results_count", "response_time", "timestamp"]]
+        hist_df["timestamp"] = hist_df["timestamp"].dt.strftime("%H:%M")
+        st.dataframe(hist_df, hide_index=True, use_container_width=True)
 
 elif st.session_state.current_page == "analytics":
     # === ANALYTICS PAGE ===
     st.markdown("### 📊 System Analytics & Performance")
     
     # Performance metrics
-    if st.session_state.response_times:
-        st.markdown("#### ⚡ Response Time Analytics")
-        
-        df = pd.DataFrame(st.session_state.response_times)
-        
+    @st.fragment
+    def _render_response_time_charts():
+        # Fragment: chart-level interactions rerun only this block.
+        # Zero-copy view over the columnar buffers instead of per-row parsing.
+        n = st.session_state._rt_n
+        df = pd.DataFrame({
+            "timestamp": st.session_state.rt_times[:n],
+            "response_time": st.session_state.rt_values[:n],
+        }, copy=False)
+
         col1, col2 = st.columns(2)
         with col1:
-            # Response time trend
-            fig = px.line(
-                df, 
-                x="timestamp", 
-                y="response_time",
-                title="Response Time Trend",
-                labels={"response_time": "Response Time (ms)", "timestamp": "Time"}
-            )
+            # Response time trend - WebGL trace renders on the GPU canvas
+            # instead of SVG, which scales much better with point count.
+            # LTTB-downsample long sessions so at most ~1500 points are sent.
+            trend_values = df["response_time"].to_numpy(dtype=np.float64)
+            keep = _lttb_downsample(np.arange(len(trend_values), dtype=np.float64), trend_values)
+            trend = df.iloc[keep]
+            fig = _response_trend_fig(tuple(trend["timestamp"]), tuple(trend["response_time"]))
             st.plotly_chart(fig, use_container_width=True)
-        
+
         with col2:
-            # Response time distribution
-            fig = px.histogram(
-                df,
-                x="response_time",
-                title="Response Time Distribution",
-                labels={"response_time": "Response Time (ms)", "count": "Frequency"}
+            # Response time distribution - pre-binned with numpy so Plotly
+            # only draws the bars instead of binning client-side
+            fig = _histogram_fig(
+                tuple(trend_values), "auto",
+                "Response Time Distribution", "Response Time (ms)"
             )
             st.plotly_chart(fig, use_container_width=True)
-        
-        # Statistics
+
+    if st.session_state._rt_n:
+        st.markdown("#### ⚡ Response Time Analytics")
+
+        _render_response_time_charts()
+
+
+        # Statistics - numpy reductions over one contiguous array instead of
+        # Python-level sum/min/max passes over a list of dicts
         st.markdown("#### 📈 Statistics")
         col1, col2, col3, col4 = st.columns(4)
-        
-        response_times = [r["response_time"] for r in st.session_state.response_times]
+
+        response_times = st.session_state.rt_values[:st.session_state._rt_n]
         with col1:
-            st.metric("Average", f"{sum(response_times) / len(response_times):.0f}ms")
+            st.metric("Average", f"{response_times.mean():.0f}ms")
         with col2:
-            st.metric("Minimum", f"{min(response_times):.0f}ms")
+            st.metric("Minimum", f"{response_times.min():.0f}ms")
         with col3:
-            st.metric("Maximum", f"{max(response_times):.0f}ms")
+            st.metric("Maximum", f"{response_times.max():.0f}ms")
         with col4:
-            st.metric("Total Queries", len(st.session_state.response_times))
+            st.metric("Total Queries", len(response_times))
     
     # Usage analytics
     st.markdown("---")
@@ -1198,35 +1570,35 @@ elif st.session_state.current_page == "analytics":
         st.metric("🏥 Health Checks", health_checks)
     
     # Question analytics
-    if st.session_state.conversation_history:
-        st.markdown("---")
-        st.markdown("#### ❓ Question Analytics")
-        
-        questions = [entry["question"] for entry in st.session_state.conversation_history]
-        question_lengths = [len(q.split()) for q in questions]
-        
+    @st.fragment
+    def _render_question_charts():
+        conv_df = pd.DataFrame(st.session_state.conversation_history)
+        question_lengths = conv_df["question"].str.split().str.len().to_numpy()
+
         col1, col2 = st.columns(2)
         with col1:
-            fig = px.histogram(
-                x=question_lengths,
-                title="Question Length Distribution",
-                labels={"x": "Words per Question", "y": "Frequency"}
+            n_bins = min(50, max(1, int(np.sqrt(len(question_lengths)))))
+            fig = _histogram_fig(
+                tuple(question_lengths.tolist()), n_bins,
+                "Question Length Distribution", "Words per Question"
             )
             st.plotly_chart(fig, use_container_width=True)
-        
+
         with col2:
-            success_rate = sum(1 for entry in st.session_state.conversation_history if entry.get("success", False))
-            success_percentage = (success_rate / len(st.session_state.conversation_history)) * 100
-            
-            fig = go.Figure(data=[
-                go.Pie(
-                    labels=["Successful", "Failed"],
-                    values=[success_rate, len(st.session_state.conversation_history) - success_rate],
-                    title="Query Success Rate"
-                )
-            ])
+            if "success" in conv_df.columns:
+                success_rate = int(conv_df["success"].fillna(False).astype(bool).to_numpy().sum())
+            else:
+                success_rate = 0
+
+            fig = _success_pie_fig(success_rate, len(st.session_state.conversation_history))
             st.plotly_chart(fig, use_container_width=True)
 
+    if st.session_state.conversation_history:
+        st.markdown("---")
+        st.markdown("#### ❓ Question Analytics")
+
+        _render_question_charts()
+
 elif st.session_state.current_page == "settings":
     # === SETTINGS PAGE ===
     st.markdown("### ⚙️ Settings & Configuration")
@@ -1239,14 +1611,19 @@ elif st.session_state.current_page == "settings":
         if st.button("📤 Export Chat History", use_container_width=True):
             if st.session_state.conversation_history:
                 export_data = {
-                    "conversation_history": st.session_state.conversation_history,
-                    "search_history": st.session_state.search_history,
+                    "conversation_history": list(st.session_state.conversation_history),
+                    "search_history": list(st.session_state.search_history),
                     "favorite_questions": st.session_state.favorite_questions,
                     "export_timestamp": datetime.now().isoformat()
                 }
                 st.download_button(
                     "💾 Download JSON",
-                    data=json.dumps(export_data, indent=2),
+                    # orjson serializes datetimes natively and returns bytes,
+                    # which st.download_button accepts directly
+                    data=orjson.dumps(
+                        export_data,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC
+                    ),
                     file_name=f"rag_chat_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json"
                 )
@@ -1256,10 +1633,12 @@ elif st.session_state.current_page == "settings":
     with col2:
         if st.button("🗑️ Reset All Data", use_container_width=True):
             if st.button("⚠️ Confirm Reset", type="secondary"):
-                st.session_state.conversation_history = []
-                st.session_state.search_history = []
+                st.session_state.conversation_history = deque(maxlen=500)
+                st.session_state.search_history = deque(maxlen=500)
                 st.session_state.favorite_questions = []
-                st.session_state.response_times = []
+                st.session_state.rt_times = None
+                st.session_state.rt_values = None
+                st.session_state._rt_n = 0
                 st.success("All data reset!")
                 st.rerun()
     
@@ -1296,12 +1675,16 @@ st.markdown("---")
 footer_col1, footer_col2, footer_col3 = st.columns(3)
 
 with footer_col1:
-    if st.session_state.backend_status:
-        status_emoji = {"healthy": "🟢", "unhealthy": "🟡", "timeout": "🔴", "connection_error": "🔴", "error": "🔴"}
-        emoji = status_emoji.get(st.session_state.backend_status["status"], "⚪")
-        st.markdown(f"**System Status:** {emoji} {st.session_state.backend_status['status'].title()}")
-    else:
-        st.markdown("**System Status:** ⚪ Unknown")
+    # Footer string is rebuilt only when the status actually changes
+    status = st.session_state.backend_status["status"] if st.session_state.backend_status else None
+    if st.session_state.get("_last_status") != status or "_footer_str" not in st.session_state:
+        if status is not None:
+            emoji = _STATUS_EMOJI.get(status, "⚪")
+            st.session_state._footer_str = f"**System Status:** {emoji} {status.title()}"
+        else:
+            st.session_state._footer_str = "**System Status:** ⚪ Unknown"
+        st.session_state._last_status = status
+    st.markdown(st.session_state._footer_str)
 
 with footer_col2:
     st.markdown(f"**Active Page:** 📋 {st.session_state.current_page.title()}")
@@ -1309,9 +1692,4 @@ with footer_col2:
 with footer_col3:
     st.markdown(f"**Session:** 💬 {len(st.session_state.conversation_history)} chats")
 
-st.markdown("""
-<div style='text-align: center; color: #666; padding: 1rem; margin-top: 2rem; border-top: 1px solid #eee;'>
-    <p>🧠 <strong>RAG Document Assistant Pro v3.0</strong> | Powered by Qdrant Cloud & Azure OpenAI</p>
-    <p>💡 Enhanced with multi-page navigation, analytics, and advanced search capabilities!</p>
-</div>
-""", unsafe_allow_html=True)
+st.html(_FOOTER_HTML)
@@ -0,0 +1,94 @@
+"""Disk-backed embedding cache for the diagnostic scripts.
+
+Repeated script runs re-embed identical sample queries against Azure
+OpenAI, paying a 100-300ms round-trip per text for answers that never
+change. Caching vectors by content hash makes subsequent runs read from
+disk in microseconds and spend zero tokens.
+"""
+
+import hashlib
+import logging
+import os
+import shelve
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.path.join(os.path.dirname(__file__), ".embed_cache")
+
+
+class CachedEmbeddings:
+    """Wrap an embeddings client with a persistent content-hash cache.
+
+    Mirrors the AzureOpenAIEmbeddings interface the scripts rely on
+    (``embed_documents`` / ``embed_query``). Keys are
+    sha256(model_name + text) so switching embedding models never serves
+    stale vectors. Misses are batched through the underlying client and
+    written back; an in-process dict fronts the shelve store so repeated
+    lookups within one run skip disk entirely.
+    """
+
+    def __init__(self, inner, model_name: str, cache_path: str = CACHE_PATH):
+        self._inner = inner
+        self._model_name = model_name
+        self._cache_path = cache_path
+        self._mem: Dict[str, List[float]] = {}
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self._model_name}|{text}".encode()).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(t) for t in texts]
+        vectors = [self._mem.get(k) for k in keys]
+        misses = [i for i, v in enumerate(vectors) if v is None]
+        if not misses:
+            return vectors
+
+        with shelve.open(self._cache_path) as store:
+            for i in list(misses):
+                cached = store.get(keys[i])
+                if cached is not None:
+                    vectors[i] = cached
+                    self._mem[keys[i]] = cached
+                    misses.remove(i)
+
+            if misses:
+                fresh = self._inner.embed_documents([texts[i] for i in misses])
+                for i, vector in zip(misses, fresh):
+                    vectors[i] = vector
+                    store[keys[i]] = vector
+                    self._mem[keys[i]] = vector
+
+        hits = len(texts) - len(misses)
+        logger.info(f"Embedding cache: {hits}/{len(texts)} hits, {len(misses)} API calls")
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async variant of embed_documents: same cache, awaited misses."""
+        keys = [self._key(t) for t in texts]
+        vectors = [self._mem.get(k) for k in keys]
+        misses = [i for i, v in enumerate(vectors) if v is None]
+        if not misses:
+            return vectors
+
+        with shelve.open(self._cache_path) as store:
+            for i in list(misses):
+                cached = store.get(keys[i])
+                if cached is not None:
+                    vectors[i] = cached
+                    self._mem[keys[i]] = cached
+                    misses.remove(i)
+
+            if misses:
+                fresh = await self._inner.aembed_documents([texts[i] for i in misses])
+                for i, vector in zip(misses, fresh):
+                    vectors[i] = vector
+                    store[keys[i]] = vector
+                    self._mem[keys[i]] = vector
+
+        hits = len(texts) - len(misses)
+        logger.info(f"Embedding cache: {hits}/{len(texts)} hits, {len(misses)} API calls")
+        return vectors
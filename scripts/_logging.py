@@ -0,0 +1,22 @@
+"""Shared logger factory for the maintenance scripts.
+
+Each script used to call ``logging.basicConfig`` with its own handler
+list; importing one script from another then attached a second handler
+and every line was formatted and written twice. The factory attaches a
+handler only once per logger.
+"""
+
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a console logger, attaching a handler only on first use."""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    return logger
@@ -13,9 +13,9 @@ Usage:
 
 import os
 import sys
-import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Any, Dict, List, Optional
 
 # Add parent directory to path to import backend modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -23,46 +23,47 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from dotenv import load_dotenv
 load_dotenv()
 
-from qdrant_client import QdrantClient
-from backend.config import get_first_env
+# qdrant_client is imported lazily inside the shared factory so the
+# fake-services early exit never pays its import cost
+import _rag_clients
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-    ]
-)
-logger = logging.getLogger(__name__)
+from _logging import get_logger
+logger = get_logger(__name__)
 
 # --- Configuration Constants ---
 COLLECTION_NAME = os.environ.get("QDRANT_COLLECTION_NAME", "documents")
 
-def initialize_qdrant() -> QdrantClient:
+@dataclass
+class QdrantCtx:
+    """Qdrant client plus the collection snapshot fetched at startup."""
+    client: Any
+    collection_info: Optional[Any] = None
+
+    def refresh(self):
+        """Re-fetch the collection snapshot for callers that need it fresh."""
+        self.collection_info = self.client.get_collection(COLLECTION_NAME)
+        return self.collection_info
+
+
+def initialize_qdrant() -> Optional[QdrantCtx]:
     """Initialize Qdrant client."""
     try:
-        qdrant_url = get_first_env("QDRANT_URL")
-        qdrant_api_key = get_first_env("QDRANT_API_KEY")
-        
-        if not qdrant_url:
-            raise ValueError("QDRANT_URL environment variable is required")
-        
-        client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key)
-        
+        ctx = QdrantCtx(client=_rag_clients.qdrant_client())
+
         try:
-            client.get_collection(COLLECTION_NAME)
+            ctx.refresh()
             logger.info(f"Connected to Qdrant collection: {COLLECTION_NAME}")
         except Exception as e:
             logger.warning(f"Collection '{COLLECTION_NAME}' not found: {e}")
-        
-        return client
-        
+
+        return ctx
+
     except Exception as e:
         logger.error(f"Failed to initialize Qdrant client: {e}")
         return None
 
-def get_recommendations(qdrant_client: QdrantClient = None) -> Dict[str, List[str]]:
+def get_recommendations(ctx: QdrantCtx = None) -> Dict[str, List[str]]:
     """Generate RAG system enhancement recommendations."""
     
     # Recommendations by category
@@ -98,11 +99,11 @@ def get_recommendations(qdrant_client: QdrantClient = None) -> Dict[str, List[st
     }
     
     # Check if we have a database connection to provide targeted recommendations
-    if qdrant_client:
+    if ctx:
         try:
-            # Get collection info
-            collection_info = qdrant_client.get_collection(COLLECTION_NAME)
-            points_count = collection_info.points_count
+            # count(exact=False) returns a bare integer instead of the full
+            # collection-info blob with HNSW/optimizer/vector config
+            points_count = ctx.client.count(collection_name=COLLECTION_NAME, exact=False).count
             
             # Add specific recommendations based on collection size
             if points_count < 500:
@@ -120,7 +121,9 @@ def get_recommendations(qdrant_client: QdrantClient = None) -> Dict[str, List[st
                     "Consider implementing vector indexes or approximate search for speed"
                 ]
             
-            # Get vector configuration
+            # Get vector configuration from the startup snapshot; only
+            # re-fetched if the startup probe failed to capture one
+            collection_info = ctx.collection_info if ctx.collection_info is not None else ctx.refresh()
             vector_config = collection_info.config.params.vectors
             
             # Add recommendations based on vector configuration
@@ -137,41 +140,78 @@ def get_recommendations(qdrant_client: QdrantClient = None) -> Dict[str, List[st
     
     return recommendations
 
+# Section titles are fixed; build them once at module scope instead of
+# reconstructing the dicts on every call
+_CONSOLE_TITLES = {
+    "retrieval_quality": "🔍 RETRIEVAL QUALITY IMPROVEMENTS:",
+    "indexing": "📚 DOCUMENT INDEXING ENHANCEMENTS:",
+    "prompting": "💬 PROMPT ENGINEERING UPDATES:",
+    "system_config": "⚙️ SYSTEM CONFIGURATION CHANGES:",
+    "vector_config": "🧮 VECTOR DATABASE CONFIGURATION:"
+}
+_MARKDOWN_TITLES = {
+    "retrieval_quality": "Retrieval Quality Improvements",
+    "indexing": "Document Indexing Enhancements",
+    "prompting": "Prompt Engineering Updates",
+    "system_config": "System Configuration Changes",
+    "vector_config": "Vector Database Configuration"
+}
+_PRIORITY_STEPS = [
+    "1. First address any critical recommendations",
+    "2. Improve document indexing and chunking",
+    "3. Enhance retrieval quality settings",
+    "4. Update prompt engineering",
+    "5. Fine-tune system configuration"
+]
+
+
 def print_recommendation_checklist(recommendations: Dict[str, List[str]]):
     """Print recommendations in an actionable checklist format."""
-    
-    print("\n===== RAG Performance Enhancement Checklist =====\n")
-    
-    # Print critical recommendations first if they exist
+
+    # Collect everything into one buffer and print it once: a single
+    # flush instead of dozens of line-sized writes to stdout
+    lines = ["", "===== RAG Performance Enhancement Checklist =====", ""]
+
+    # Critical recommendations come first if they exist
     if "critical" in recommendations:
-        print("🔴 CRITICAL RECOMMENDATIONS:")
-        for i, rec in enumerate(recommendations["critical"], 1):
-            print(f"  {i}. {rec}")
-        print()
-        
-    # Print other recommendation categories
-    categories = {
-        "retrieval_quality": "🔍 RETRIEVAL QUALITY IMPROVEMENTS:",
-        "indexing": "📚 DOCUMENT INDEXING ENHANCEMENTS:",
-        "prompting": "💬 PROMPT ENGINEERING UPDATES:",
-        "system_config": "⚙️ SYSTEM CONFIGURATION CHANGES:",
-        "vector_config": "🧮 VECTOR DATABASE CONFIGURATION:"
-    }
-    
-    for category, title in categories.items():
-        if category in recommendations and category != "critical":
-            print(title)
-            for i, rec in enumerate(recommendations[category], 1):
-                print(f"  □ {i}. {rec}")
-            print()
-    
-    print("======= Implementation Priority Order =======")
-    print("1. First address any critical recommendations")
-    print("2. Improve document indexing and chunking")
-    print("3. Enhance retrieval quality settings")
-    print("4. Update prompt engineering")
-    print("5. Fine-tune system configuration")
-    print("===========================================\n")
+        lines.append("🔴 CRITICAL RECOMMENDATIONS:")
+        lines.extend(f"  {i}. {rec}" for i, rec in enumerate(recommendations["critical"], 1))
+        lines.append("")
+
+    for category, title in _CONSOLE_TITLES.items():
+        if category in recommendations:
+            lines.append(title)
+            lines.extend(f"  □ {i}. {rec}" for i, rec in enumerate(recommendations[category], 1))
+            lines.append("")
+
+    lines.append("======= Implementation Priority Order =======")
+    lines.extend(_PRIORITY_STEPS)
+    lines.append("===========================================\n")
+    print("\n".join(lines))
+
+
+def format_recommendations_markdown(recommendations: Dict[str, List[str]]) -> str:
+    """Render the recommendations as a markdown checklist document."""
+    lines = ["# RAG System Enhancement Recommendations", ""]
+
+    if "critical" in recommendations:
+        lines.append("## Critical Recommendations")
+        lines.append("")
+        lines.extend(f"- [ ] {rec}" for rec in recommendations["critical"])
+        lines.append("")
+
+    for category, title in _MARKDOWN_TITLES.items():
+        if category in recommendations:
+            lines.append(f"## {title}")
+            lines.append("")
+            lines.extend(f"- [ ] {rec}" for rec in recommendations[category])
+            lines.append("")
+
+    lines.append("## Implementation Priority")
+    lines.append("")
+    lines.extend(_PRIORITY_STEPS)
+    lines.append("")
+    return "\n".join(lines)
 
 def main():
     """Main function to generate and display recommendations."""
@@ -182,51 +222,23 @@ def main():
     if use_fake_services:
         logger.info("⚠️ Running in FAKE SERVICES mode")
         print("\n⚠️ System is running in FAKE SERVICES mode. Turn off this mode for proper analysis.")
-        qdrant_client = None
+        ctx = None
     else:
         # Initialize Qdrant client
-        qdrant_client = initialize_qdrant()
-    
+        ctx = initialize_qdrant()
+
     # Generate recommendations
-    recommendations = get_recommendations(qdrant_client)
+    recommendations = get_recommendations(ctx)
     
     # Print recommendations
     print_recommendation_checklist(recommendations)
     
-    # Save recommendations to file
-    with open("scripts/rag_recommendations.md", "w") as f:
-        f.write("# RAG System Enhancement Recommendations\n\n")
-        
-        # Write critical recommendations first if they exist
-        if "critical" in recommendations:
-            f.write("## Critical Recommendations\n\n")
-            for rec in recommendations["critical"]:
-                f.write(f"- [ ] {rec}\n")
-            f.write("\n")
-            
-        # Write other recommendation categories
-        categories = {
-            "retrieval_quality": "Retrieval Quality Improvements",
-            "indexing": "Document Indexing Enhancements",
-            "prompting": "Prompt Engineering Updates",
-            "system_config": "System Configuration Changes",
-            "vector_config": "Vector Database Configuration"
-        }
-        
-        for category, title in categories.items():
-            if category in recommendations and category != "critical":
-                f.write(f"## {title}\n\n")
-                for rec in recommendations[category]:
-                    f.write(f"- [ ] {rec}\n")
-                f.write("\n")
-                
-        f.write("## Implementation Priority\n\n")
-        f.write("1. First address any critical recommendations\n")
-        f.write("2. Improve document indexing and chunking\n")
-        f.write("3. Enhance retrieval quality settings\n")
-        f.write("4. Update prompt engineering\n")
-        f.write("5. Fine-tune system configuration\n")
-    
+    # Save recommendations to file: format the whole document in memory
+    # and write it in one call instead of dozens of line-sized f.write()s
+    Path("scripts/rag_recommendations.md").write_text(
+        format_recommendations_markdown(recommendations), encoding="utf-8"
+    )
+
     logger.info("✅ Recommendations saved to scripts/rag_recommendations.md")
     
     # Provide immediate fix recommendations
@@ -10,21 +10,38 @@ Usage:
     python scripts/fix_rag_threshold.py
 """
 
+import ast
+import mmap
 import os
 import sys
-import logging
-import re
 from pathlib import Path
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-    ]
-)
-logger = logging.getLogger(__name__)
+sys.path.insert(0, os.path.dirname(__file__))
+from _logging import get_logger
+logger = get_logger(__name__)
+
+# Target threshold hoisted to module scope so a future multi-file sweep
+# shares one definition instead of re-deriving it per file
+NEW_THRESHOLD = "0.3"
+
+
+def _find_threshold_nodes(content: str) -> list:
+    """Locate every ``score_threshold=<float>`` keyword argument via the AST.
+
+    A structural lookup can't be fooled by thresholds mentioned in strings
+    or comments, and finds all call sites instead of just the first match.
+    """
+    nodes = []
+    for node in ast.walk(ast.parse(content)):
+        if isinstance(node, ast.Call):
+            for keyword in node.keywords:
+                if (keyword.arg == "score_threshold"
+                        and isinstance(keyword.value, ast.Constant)
+                        and isinstance(keyword.value.value, float)):
+                    nodes.append(keyword.value)
+    return nodes
+
 
 def create_processor_patch():
     """Create a patch for the query processor to fix the threshold."""
@@ -35,35 +52,43 @@ def create_processor_patch():
         logger.error(f"File not found: {query_processor_path}")
         return False
     
-    # Read the current file
-    content = query_processor_path.read_text(encoding="utf-8")
-    
-    # Find the search threshold
-    search_pattern = r"(score_threshold=)(0\.\d+)"
-    match = re.search(search_pattern, content)
-    
-    if not match:
+    # Byte-level pre-scan over a memory map: bail out before decoding and
+    # AST-parsing the whole file when no threshold exists at all. The
+    # keyword is ASCII, so the bytes search is exact on UTF-8 source.
+    with open(query_processor_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"score_threshold") == -1:
+                logger.error("Could not find score_threshold parameter in the file")
+                return False
+            content = mm[:].decode("utf-8")
+
+    # Find every score_threshold keyword argument structurally
+    threshold_nodes = _find_threshold_nodes(content)
+
+    if not threshold_nodes:
         logger.error("Could not find score_threshold parameter in the file")
         return False
-    
-    current_threshold = match.group(2)
+
+    current_threshold = ", ".join(sorted({str(node.value) for node in threshold_nodes}))
     logger.info(f"Found current threshold: {current_threshold}")
-    
+
     # Create backup file
     backup_path = query_processor_path.with_suffix(".py.bak")
     logger.info(f"Creating backup at {backup_path}")
     backup_path.write_text(content, encoding="utf-8")
-    
-    # Replace the threshold
-    new_threshold = "0.3"
-    new_content = content.replace(
-        f"score_threshold={current_threshold}",
-        f"score_threshold={new_threshold}"
-    )
-    
+
+    # Rewrite only the literal spans the AST located, last-to-first so
+    # earlier offsets stay valid; all other formatting is untouched
+    new_threshold = NEW_THRESHOLD
+    lines = content.splitlines(keepends=True)
+    for node in sorted(threshold_nodes, key=lambda n: (n.lineno, n.col_offset), reverse=True):
+        line = lines[node.lineno - 1]
+        lines[node.lineno - 1] = line[:node.col_offset] + new_threshold + line[node.end_col_offset:]
+    new_content = "".join(lines)
+
     # Write the modified file
     query_processor_path.write_text(new_content, encoding="utf-8")
-    logger.info(f"Updated score_threshold from {current_threshold} to {new_threshold}")
+    logger.info(f"Updated score_threshold from {current_threshold} to {new_threshold} at {len(threshold_nodes)} call site(s)")
     
     # Create patch content
     patch_content = f"""